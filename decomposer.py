@@ -3,54 +3,269 @@
 dep_extractor.py
 
 Usage:
-    python dep_extractor.py /path/to/java/project --out results.json
+    python dep_extractor.py /path/to/java/project --out results.json [--jobs N] [--cache | --cache-dir DIR]
 
 Output:
  - <out> will contain direct dependency graph and per-class metadata.
  - results_transitive.json will contain transitive closure for each class.
 
 Notes:
- - Uses javalang for AST parsing + regex heuristics for legacy patterns.
+ - Uses tree-sitter-java for AST parsing when installed (pip install tree_sitter tree_sitter_java),
+   falling back to javalang for files it can't parse, + regex heuristics for legacy patterns.
+ - With --cache (or --cache-dir DIR), per-file extraction results are cached as JSON under
+   $XDG_CACHE_HOME/dep_extractor (or DIR), keyed by a hash of the file contents, so re-runs
+   only re-parse files that changed. Entries unused for 30 days are pruned.
  - Improve heuristics for your codebase if needed.
 """
 
 import os
 import re
+import sys
 import json
+import hashlib
+import time
+import mmap
 import argparse
+import functools
+import contextlib
 from collections import defaultdict, deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     import javalang
 except Exception as e:
     raise SystemExit("Missing dependency: pip install javalang") from e
 
+try:
+    import orjson  # optional: much faster JSON output
+except ImportError:
+    orjson = None
+
+try:
+    # optional: native parser, far faster than javalang's pure-Python one
+    import tree_sitter
+    import tree_sitter_java
+except ImportError:
+    tree_sitter = None
+
 # -----------------------
 # Regex heuristics
 # -----------------------
-RE_NEW = re.compile(r'\bnew\s+([A-Za-z_][A-Za-z0-9_]*(?:<[^\>]+>)?)')  # new ClassName or new ClassName<...>
+# The context-dependent heuristics fused into one alternation so the source is
+# scanned once. Each branch only consumes what it must (the rest sits in
+# lookaheads), so a class name matched by one branch is still seen by the others.
+RE_HEURISTICS = re.compile(
+    r'\bnew\s+(?=(?P<new>[A-Za-z_][A-Za-z0-9_]*))'  # new ClassName / new ClassName<...>
+    r'|(?P<pkg>\b[a-z]\w*(?:\.[A-Za-z_]\w*)+)\.(?=(?P<cls>[A-Z][A-Za-z0-9_]+)\b(?P<call>\s*\()?)'  # com.x.YClass
+    r'|(?P<static>\b[A-Z][A-Za-z0-9_]+)(?=\s*\.\s*[A-Za-z_][A-Za-z0-9_]*\s*\()'  # ClassName.method(
+)
+# Just the FQCN heuristic, for files the AST already covers (see scan_source)
 RE_FQCN = re.compile(r'\b([a-z][\w]*(?:\.[A-Za-z_][\w]*)+\.[A-Z][A-Za-z0-9_]+)\b')  # com.x.YClass
-RE_SIMPLE_FQ = re.compile(r'\b([A-Z][A-Za-z0-9_]+)\b')  # simple identifiers starting with uppercase (class candidates)
-RE_STATIC_CALL = re.compile(r'\b([A-Z][A-Za-z0-9_]+)\s*\.\s*[A-Za-z_][A-Za-z0-9_]*\s*\(')  # ClassName.method(
-RE_MEMBER_REF = re.compile(r'\b([A-Z][A-Za-z0-9_]+)\s*\.\s*[A-Za-z_][A-Za-z0-9_]*\b')  # ClassName.something
+# Plain identifiers need no context: the file is tokenized once into words and
+# class candidates (capitalized identifiers) are picked from that set.
+RE_WORD = re.compile(r'\w+')
+RE_CLASS_CANDIDATE = re.compile(r'[A-Z][A-Za-z0-9_]+')
+
+# Java keywords and common JDK types/annotations: never project classes, so they are
+# filtered from simple identifiers and from direct dependencies to reduce noise
+# (and the fan-out it causes in the transitive closure)
+JAVA_NOISE = frozenset({
+    # keywords, literals and reserved type names
+    'abstract', 'assert', 'boolean', 'break', 'byte', 'case', 'catch', 'char', 'class', 'const',
+    'continue', 'default', 'do', 'double', 'else', 'enum', 'extends', 'final', 'finally', 'float',
+    'for', 'goto', 'if', 'implements', 'import', 'instanceof', 'int', 'interface', 'long', 'native',
+    'new', 'package', 'private', 'protected', 'public', 'return', 'short', 'static', 'strictfp',
+    'super', 'switch', 'synchronized', 'this', 'throw', 'throws', 'transient', 'try', 'void',
+    'volatile', 'while', 'true', 'false', 'null', 'var', 'record', 'yield', 'sealed', 'permits',
+    # java.lang
+    'Object', 'String', 'StringBuilder', 'StringBuffer', 'CharSequence', 'Integer', 'Long', 'Short',
+    'Byte', 'Character', 'Boolean', 'Double', 'Float', 'Number', 'Void', 'Math', 'StrictMath',
+    'System', 'Runtime', 'Thread', 'Runnable', 'Class', 'ClassLoader', 'Enum', 'Record', 'Iterable',
+    'Comparable', 'AutoCloseable', 'Cloneable',
+    'Throwable', 'Exception', 'Error', 'RuntimeException', 'IllegalArgumentException',
+    'IllegalStateException', 'NullPointerException', 'UnsupportedOperationException',
+    'IndexOutOfBoundsException', 'ArrayIndexOutOfBoundsException', 'ClassCastException',
+    'ArithmeticException', 'NumberFormatException', 'InterruptedException',
+    'CloneNotSupportedException', 'ClassNotFoundException', 'AssertionError', 'OutOfMemoryError',
+    'StackOverflowError',
+    'Override', 'Deprecated', 'SuppressWarnings', 'FunctionalInterface', 'SafeVarargs',
+    # java.util
+    'List', 'ArrayList', 'LinkedList', 'Map', 'HashMap', 'LinkedHashMap', 'TreeMap', 'Set',
+    'HashSet', 'LinkedHashSet', 'TreeSet', 'Collection', 'Collections', 'Arrays', 'Optional',
+    'Objects', 'Iterator', 'Queue', 'Deque', 'ArrayDeque',
+})
 
 # -----------------------
 # Helpers
 # -----------------------
 def list_java_files(root):
-    files = []
-    for dirpath, _, filenames in os.walk(root):
-        for f in filenames:
-            if f.endswith('.java'):
-                files.append(os.path.join(dirpath, f))
-    return files
-
-def read_file(path):
-    with open(path, 'r', encoding='utf-8', errors='ignore') as fh:
-        return fh.read()
+    """
+    Yield paths of all .java files under root.
+    os.scandir entries carry the file type from readdir, so unlike os.walk no
+    extra stat is needed per entry.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError:
+        # unreadable directory: skip it, as os.walk does
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from list_java_files(entry.path)
+            elif entry.name.endswith('.java') and not entry.is_dir():
+                # a symlink to a directory is neither descended into nor a source file,
+                # as with os.walk
+                yield entry.path
+
+# files at least this big are mapped rather than read into a bytes copy
+MMAP_THRESHOLD = 1 << 20
+
+@contextlib.contextmanager
+def open_source(path):
+    """
+    Yield the raw contents of path as a bytes-like object: bytes from plain
+    os.read calls for ordinary files, a read-only mmap for large ones.
+    Only valid inside the with block.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+        else:
+            chunks = []
+            while True:
+                chunk = os.read(fd, max(size, 1 << 16))
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            yield chunks[0] if len(chunks) == 1 else b''.join(chunks)
+    finally:
+        os.close(fd)
+
+# Class/package names repeat across thousands of files; interning keeps one copy
+# of each in the graph, metadata and closure, and makes dict/set lookups cheaper.
+intern = sys.intern
 
 def simple_class_name(fqcn):
-    return fqcn.split('.')[-1]
+    # rpartition returns a fixed 3-tuple instead of building a list of every segment
+    return fqcn.rpartition('.')[2]
+
+def parallel_map(fn, items, jobs):
+    """
+    Map fn over items in a process pool (javalang is pure Python, so threads
+    would just contend on the GIL). jobs <= 1 runs in-process.
+    """
+    if jobs <= 1:
+        return list(map(fn, items))
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        return list(ex.map(fn, items, chunksize=16))
+
+def dump_json_bytes(obj, indent=False):
+    """Serialize obj to UTF-8 JSON bytes with sorted keys (orjson if installed, else json)."""
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), sort_keys=True, ensure_ascii=False).encode('utf-8')
+
+def write_json_stream(path, mapping):
+    """
+    Write mapping as a JSON object, one entry per line, encoding entry by entry
+    so the full document is never built in memory.
+    """
+    with open(path, 'wb') as fh:
+        fh.write(b'{')
+        for i, key in enumerate(sorted(mapping)):
+            fh.write(b',\n' if i else b'\n')
+            fh.write(dump_json_bytes(key))
+            fh.write(b': ')
+            fh.write(dump_json_bytes(mapping[key]))
+        fh.write(b'\n}\n')
+
+# -----------------------
+# Per-file result cache
+# -----------------------
+# bump when extraction logic changes so stale cache entries are ignored
+CACHE_VERSION = b'dep-extractor-5'
+# entries not read or written for this long are deleted at startup
+CACHE_MAX_AGE_DAYS = 30
+RE_CACHE_ENTRY = re.compile(r'[0-9a-f]{32}\.json(?:\.\d+\.tmp)?')
+# ast_info keys that hold a str/list rather than a set
+AST_PLAIN_KEYS = ('package', 'types', 'imports')
+
+def default_cache_dir():
+    """Per-user cache location: $XDG_CACHE_HOME/dep_extractor (default ~/.cache/dep_extractor)."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'dep_extractor')
+
+def cache_key(data):
+    """Content hash of a source file, keyed with the extractor version and parser backend."""
+    salt = CACHE_VERSION + (b':tree-sitter' if tree_sitter is not None else b':javalang')
+    return hashlib.blake2b(data, digest_size=16, key=salt).hexdigest()
+
+def encode_cached(result):
+    """scan_source result -> JSON-serializable lists (entries are plain data, never pickles)."""
+    parsed_ok, ast_info, regex_info, words = result
+    ast_info = {k: v if k in AST_PLAIN_KEYS else list(v) for k, v in ast_info.items()}
+    return [parsed_ok, ast_info, {k: list(v) for k, v in regex_info.items()}, list(words)]
+
+def decode_cached(obj):
+    """Inverse of encode_cached."""
+    parsed_ok, ast_info, regex_info, words = obj
+    ast_info = {k: v if k in AST_PLAIN_KEYS else set(map(intern, v)) for k, v in ast_info.items()}
+    if ast_info['package'] is not None:
+        ast_info['package'] = intern(ast_info['package'])
+    ast_info['types'] = list(map(intern, ast_info['types']))
+    ast_info['imports'] = list(map(intern, ast_info['imports']))
+    regex_info = {k: set(map(intern, v)) for k, v in regex_info.items()}
+    return bool(parsed_ok), ast_info, regex_info, set(map(intern, words))
+
+def load_cached(cache_dir, key):
+    path = os.path.join(cache_dir, key + '.json')
+    try:
+        with open(path, 'rb') as fh:
+            raw = fh.read()
+        result = decode_cached(orjson.loads(raw) if orjson is not None else json.loads(raw))
+        os.utime(path)  # mark as recently used so prune_cache keeps it
+        return result
+    except Exception:
+        # missing, unreadable or malformed entry: treat as a miss
+        return None
+
+def store_cached(cache_dir, key, value):
+    path = os.path.join(cache_dir, key + '.json')
+    tmp = f"{path}.{os.getpid()}.tmp"  # workers may race on the same content
+    try:
+        with open(tmp, 'wb') as fh:
+            fh.write(dump_json_bytes(encode_cached(value)))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+def prune_cache(cache_dir, max_age_days=CACHE_MAX_AGE_DAYS):
+    """
+    Delete cache entries unused for max_age_days. Entries from older extractor
+    versions or of since-edited files are never read again, so they age out here.
+    Only files named like cache entries are touched.
+    """
+    cutoff = time.time() - max_age_days * 86400
+    try:
+        entries = list(os.scandir(cache_dir))
+    except OSError:
+        return
+    for entry in entries:
+        if not RE_CACHE_ENTRY.fullmatch(entry.name):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
 
 # -----------------------
 # Extractors
@@ -62,11 +277,32 @@ def parse_with_javalang(src):
     except Exception:
         return None
 
+# The AST walk in extract_from_ast dispatches on exact node type (a dict/set lookup)
+# rather than an isinstance chain per node; none of these node types are subclassed.
+JAVALANG_QUALIFIER_NODES = {
+    javalang.tree.MethodInvocation: 'method_invocations',
+    javalang.tree.MemberReference: 'member_references',
+}
+
+def _subclasses(cls):
+    found = {cls}
+    pending = [cls]
+    while pending:
+        for sub in pending.pop().__subclasses__():
+            if sub not in found:
+                found.add(sub)
+                pending.append(sub)
+    return found
+
+# exact types the AST walk descends into: every javalang Node class, list and tuple
+JAVALANG_WALK_TYPES = frozenset(_subclasses(javalang.ast.Node) | {list, tuple})
+
 def extract_from_ast(tree):
     """
     Extract candidate dependencies using javalang AST where possible.
-    Returns a dict with keys: package, types(list of class names), imports, extends, implements,
-    method_invocations (qualifier based), member_references (qualifier based), creators (new expressions).
+    Returns a dict with keys: package, types(list of class names), imports(list), and sets
+    extends, implements, method_invocations (qualifier based), member_references (qualifier based),
+    creators (new expressions).
     """
     result = {
         'package': None,
@@ -84,17 +320,17 @@ def extract_from_ast(tree):
 
     # package
     if getattr(tree, 'package', None) is not None:
-        result['package'] = tree.package.name
+        result['package'] = intern(tree.package.name)
 
     # imports
     for imp in getattr(tree, 'imports', []) or []:
-        result['imports'].append(imp.path)
+        result['imports'].append(intern(imp.path))
 
     # types (top-level)
     for t in getattr(tree, 'types', []) or []:
         # t is e.g. ClassDeclaration
         if getattr(t, 'name', None):
-            result['types'].append(t.name)
+            result['types'].append(intern(t.name))
         # extends / implements
         if getattr(t, 'extends', None):
             # t.extends can be ReferenceType or list
@@ -102,84 +338,334 @@ def extract_from_ast(tree):
             if isinstance(ext, list):
                 for e in ext:
                     if getattr(e, 'name', None):
-                        result['extends'].add(e.name)
+                        result['extends'].add(intern(e.name))
             else:
                 if getattr(ext, 'name', None):
-                    result['extends'].add(ext.name)
+                    result['extends'].add(intern(ext.name))
         if getattr(t, 'implements', None):
             for impl in t.implements:
                 if getattr(impl, 'name', None):
-                    result['implements'].add(impl.name)
+                    result['implements'].add(intern(impl.name))
 
-    # walk nodes for MethodInvocation, MemberReference, and ClassCreator-like patterns
+    # walk nodes for MethodInvocation, MemberReference, and ClassCreator-like patterns,
+    # all in one pass (tree.filter would walk the whole tree once per node type)
     try:
-        for path, node in tree.filter(javalang.tree.MethodInvocation):
-            # qualifier may be None or a variable/class name
-            qual = getattr(node, 'qualifier', None)
-            if qual:
-                result['method_invocations'].add(qual)
-            # sometimes node.selectors or member present; we collect member names too if needed
-
-        for path, node in tree.filter(javalang.tree.MemberReference):
-            qual = getattr(node, 'qualifier', None)
-            if qual:
-                result['member_references'].add(qual)
-
-        # javalang uses 'ClassCreator' nodes for 'new' expressions in some versions,
-        # but to be safe, we'll also use regex on source to capture 'new' usage.
-        for path, node in tree.filter(javalang.tree.ClassCreator):
-            t = getattr(node, 'type', None)
-            if getattr(t, 'name', None):
-                result['creators'].add(t.name)
+        walk_types = JAVALANG_WALK_TYPES
+        ClassCreator = javalang.tree.ClassCreator
+        other_creators = (javalang.tree.ArrayCreator, javalang.tree.InnerClassCreator)
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            kind = type(node)
+            if kind is list or kind is tuple:
+                # javalang's own walk_tree descends into these too
+                stack.extend(c for c in node if type(c) in walk_types)
+                continue
+            key = JAVALANG_QUALIFIER_NODES.get(kind)
+            if key is not None:
+                # qualifier may be None or a variable/class name
+                qual = node.qualifier
+                if qual:
+                    result[key].add(intern(qual))
+            elif kind is ClassCreator:
+                # javalang uses 'ClassCreator' nodes for 'new' expressions in some versions,
+                # but to be safe, we'll also use regex on source to capture 'new' usage.
+                t = node.type
+                if getattr(t, 'name', None):
+                    result['creators'].add(intern(t.name))
+            elif kind in other_creators:
+                # new Foo[n], outer.new Inner(); primitives (new int[n]) and
+                # qualified array types (new a.b.C[n] -> a) are skipped, as the regex did
+                name = getattr(node.type, 'name', None)
+                if name and not name[0].islower():
+                    result['creators'].add(intern(name))
+            stack.extend(c for c in node.children if type(c) in walk_types)
     except Exception:
-        # Some javalang versions/trees may not have these node types or raise during filter.
+        # Some javalang versions/trees may not have these node types or raise during the walk.
         pass
 
-    return {k: (list(v) if isinstance(v, set) else v) for k, v in result.items()}
+    return result
+
+# -----------------------
+# tree-sitter extraction (same result shape as extract_from_ast)
+# -----------------------
+TS_TYPE_DECLARATIONS = ('class_declaration', 'interface_declaration', 'enum_declaration',
+                        'annotation_type_declaration', 'record_declaration')
+TS_QUERY_SRC = """
+(method_invocation object: (_) @invocation_object)
+(field_access) @field_access
+(object_creation_expression) @creation
+(array_creation_expression) @creation
+"""
 
-def extract_with_regex(src):
+def _ts_setup():
+    language = tree_sitter.Language(tree_sitter_java.language())
+    parser = tree_sitter.Parser(language)
+    query = tree_sitter.Query(language, TS_QUERY_SRC)
+    # tree_sitter >= 0.25 runs queries through a QueryCursor (reusable, so built once
+    # per process); 0.23/0.24 on the Query itself
+    if hasattr(tree_sitter, 'QueryCursor'):
+        return parser, tree_sitter.QueryCursor(query).captures
+    return parser, query.captures
+
+if tree_sitter is not None:
+    try:
+        TS_PARSER, ts_captures = _ts_setup()
+    except Exception:
+        # bindings too old/new for this API (e.g. 0.21's Language(path, name)):
+        # fall back to javalang rather than failing at import
+        tree_sitter = None
+
+def _ts_captures_by_name(root):
+    """Query captures as {capture name: [nodes]}; before 0.23 they come as a list of (node, name)."""
+    captures = ts_captures(root)
+    if isinstance(captures, dict):
+        return captures
+    by_name = defaultdict(list)
+    for node, name in captures:
+        by_name[name].append(node)
+    return by_name
+
+def _ts_text(node):
+    return node.text.decode('utf-8', errors='ignore')
+
+def _ts_dotted_name(node):
+    """Dotted name for identifier/scoped_identifier/field_access chains, else None (e.g. this.x, f().x)."""
+    if node.type in ('identifier', 'type_identifier'):
+        return _ts_text(node)
+    if node.type == 'scoped_identifier':
+        scope = _ts_dotted_name(node.child_by_field_name('scope'))
+        return scope and scope + '.' + _ts_text(node.child_by_field_name('name'))
+    if node.type == 'field_access':
+        obj = _ts_dotted_name(node.child_by_field_name('object'))
+        field = node.child_by_field_name('field')
+        return obj and field.type == 'identifier' and obj + '.' + _ts_text(field)
+    return None
+
+def _ts_type_name(node):
+    """
+    Name of a type reference as javalang's ReferenceType.name reports it:
+    generics dropped, and only the first segment of a qualified type (a.b.C -> a).
+    """
+    while node is not None and node.type in ('generic_type', 'scoped_type_identifier'):
+        node = node.named_children[0] if node.named_children else None
+    if node is not None and node.type == 'type_identifier':
+        return _ts_text(node)
+    return None
+
+def _ts_type_list_names(node):
+    # super_interfaces / extends_interfaces -> type_list -> types
+    names = []
+    for type_list in node.named_children:
+        if type_list.type == 'type_list':
+            names.extend(n for n in map(_ts_type_name, type_list.named_children) if n)
+    return names
+
+def extract_with_tree_sitter(data):
+    """
+    Same extraction as extract_from_ast, using tree-sitter-java instead of javalang.
+    data is the raw (UTF-8) file contents; tree-sitter parses bytes, so there is
+    no need to decode and re-encode.
+    Returns None if tree-sitter isn't installed, the file has syntax errors or
+    the bindings misbehave, so the caller can fall back to javalang.
+    """
+    if tree_sitter is None:
+        return None
+    try:
+        return _ts_extract(data)
+    except Exception:
+        return None
+
+def _ts_extract(data):
+    tree = TS_PARSER.parse(data)
+    root = tree.root_node
+    if root.has_error:
+        return None
+
+    result = {
+        'package': None,
+        'types': [],
+        'imports': [],
+        'extends': set(),
+        'implements': set(),
+        'method_invocations': set(),
+        'member_references': set(),
+        'creators': set(),
+    }
+
+    # package, imports and top-level types are direct children of the root
+    for node in root.named_children:
+        if node.type == 'package_declaration':
+            for c in node.named_children:
+                name = _ts_dotted_name(c)
+                if name:
+                    result['package'] = intern(name)
+        elif node.type == 'import_declaration':
+            for c in node.named_children:
+                name = _ts_dotted_name(c)
+                if name:
+                    result['imports'].append(intern(name))
+        elif node.type in TS_TYPE_DECLARATIONS:
+            name = node.child_by_field_name('name')
+            if name is not None:
+                result['types'].append(intern(_ts_text(name)))
+            superclass = node.child_by_field_name('superclass')
+            if superclass is not None:
+                ext = _ts_type_name(superclass.named_children[-1])
+                if ext:
+                    result['extends'].add(intern(ext))
+            interfaces = node.child_by_field_name('interfaces')
+            if interfaces is not None:
+                result['implements'].update(map(intern, _ts_type_list_names(interfaces)))
+            for c in node.named_children:
+                if c.type == 'extends_interfaces':
+                    result['extends'].update(map(intern, _ts_type_list_names(c)))
+
+    captures = _ts_captures_by_name(root)
+
+    # method invocation qualifiers: Foo.bar(), a.b.Foo.bar() (not this.x.bar(), f().bar())
+    for obj in captures.get('invocation_object', ()):
+        qual = _ts_dotted_name(obj)
+        if qual:
+            result['method_invocations'].add(intern(qual))
+
+    # member reference qualifiers: Foo.BAR, a.b.c -> a.b; only the outermost access of a
+    # chain counts, and not chains that end up qualifying a method call
+    for node in captures.get('field_access', ()):
+        parent = node.parent
+        if parent.type in ('field_access', 'method_invocation') and parent.child_by_field_name('object') == node:
+            continue
+        qual = _ts_dotted_name(node.child_by_field_name('object'))
+        if qual:
+            result['member_references'].add(intern(qual))
+
+    # new Foo(...), and as with javalang's ArrayCreator/InnerClassCreator, new Foo[n]
+    # and outer.new Inner() minus lowercase names (a.b.C[n] -> a; primitives give None)
+    for node in captures.get('creation', ()):
+        name = _ts_type_name(node.child_by_field_name('type'))
+        if not name:
+            continue
+        if node.type == 'object_creation_expression' and node.children[0].type == 'new':
+            result['creators'].add(intern(name))
+        elif not name[0].islower():
+            result['creators'].add(intern(name))
+
+    return result
+
+def extract_words(src):
+    """Set of all words in src (maximal runs of word characters), tokenized once per file."""
+    return set(RE_WORD.findall(src))
+
+def capitalized_identifiers(words):
+    """poor man's class guesses: capitalized identifiers (could be many false positives)"""
+    is_class_candidate = RE_CLASS_CANDIDATE.fullmatch
+    return {intern(w) for w in words if w not in JAVA_NOISE and is_class_candidate(w)}
+
+def extract_fqcn_with_regex(src, words):
+    """
+    Reduced regex pass for files the AST parse succeeded on: the AST already has
+    `new` creators and method invocation qualifiers, so only fully-qualified names
+    are scanned for. Same result shape as extract_with_regex; 'new' and
+    'static_classes' are left empty.
+    """
+    res = {
+        'new': set(),
+        'fqcn': set(),
+        'static_classes': set(),
+        'simple_identifiers': capitalized_identifiers(words),
+    }
+    for fq in RE_FQCN.findall(src):
+        fq = intern(fq)
+        res['fqcn'].add(fq)
+        res['simple_identifiers'].add(intern(simple_class_name(fq)))
+    return res
+
+def extract_with_regex(src, words=None):
     """
     Heuristic-based extraction using regex for:
     - new ClassName
     - fully-qualified class names (com.example.Foo)
     - static calls ClassName.method(...)
+    - capitalized simple identifiers, taken from words (extract_words(src)
+      unless the caller already has it)
     """
+    if words is None:
+        words = extract_words(src)
     res = {
         'new': set(),
         'fqcn': set(),
         'static_classes': set(),
-        'simple_identifiers': set(),
+        'simple_identifiers': capitalized_identifiers(words),
     }
 
-    for m in RE_NEW.finditer(src):
-        name = m.group(1).split('<', 1)[0].strip()
-        # skip primitives and arrays
-        if name and not name[0].islower():
-            res['new'].add(name)
-
-    for m in RE_FQCN.finditer(src):
-        fq = m.group(1)
-        res['fqcn'].add(fq)
-        res['simple_identifiers'].add(simple_class_name(fq))
-
-    for m in RE_STATIC_CALL.finditer(src):
-        cls = m.group(1)
-        res['static_classes'].add(cls)
-        res['simple_identifiers'].add(cls)
-
-    # poor man's class guesses: capitalized identifiers (could be many false positives)
-    for m in RE_SIMPLE_FQ.finditer(src):
-        ident = m.group(1)
-        # filter common Java keywords and types to reduce noise
-        if ident not in {'String','Integer','Long','Boolean','Double','Float','List','Map','Set','Optional'}:
-            res['simple_identifiers'].add(ident)
+    for m in RE_HEURISTICS.finditer(src):
+        kind = m.lastgroup
+        if kind == 'static':
+            cls = intern(m.group('static'))
+            res['static_classes'].add(cls)
+            res['simple_identifiers'].add(cls)
+        elif kind == 'new':
+            name = intern(m.group('new'))
+            # skip primitives and arrays
+            if not name[0].islower():
+                res['new'].add(name)
+        else:
+            pkg, cls = m.group('pkg'), intern(m.group('cls'))
+            res['fqcn'].add(intern(pkg + '.' + cls))
+            res['simple_identifiers'].add(cls)
+            # the qualifier was consumed here, so catch an Outer.Inner( static call in it
+            outer = intern(simple_class_name(pkg))
+            if m.group('call') and RE_CLASS_CANDIDATE.fullmatch(outer):
+                res['static_classes'].add(outer)
+                res['simple_identifiers'].add(outer)
 
-    return {k: list(v) for k, v in res.items()}
+    return res
 
 # -----------------------
 # Main scan per file
 # -----------------------
-def analyze_file(path, all_package_classes_map):
+def scan_source(data):
+    """
+    All per-file extraction that depends only on the file contents (bytes-like):
+    AST (tree-sitter if available, else javalang), regex heuristics and the word set.
+    The contents are decoded to str exactly once.
+    Returns (parsed_ok, ast_info, regex_info, words).
+    """
+    ast_info = extract_with_tree_sitter(data)
+    src = str(data, 'utf-8', 'ignore')
+    parsed_ok = ast_info is not None
+    if not parsed_ok:
+        tree = parse_with_javalang(src)
+        parsed_ok = tree is not None
+        ast_info = extract_from_ast(tree)
+    words = extract_words(src)
+    # the full heuristics are a fallback for when there is no AST
+    if parsed_ok:
+        regex_info = extract_fqcn_with_regex(src, words)
+    else:
+        regex_info = extract_with_regex(src, words)
+    return parsed_ok, ast_info, regex_info, words
+
+def parse_file(path, cache_dir=None):
+    """
+    Read and scan a single file (see scan_source). With cache_dir set, results are
+    looked up / stored by content hash so unchanged files are never re-parsed.
+    Only the extracted data is returned, not the source or syntax tree, so the
+    result stays cheap to send back from a worker process.
+    """
+    with open_source(path) as data:
+        key = None
+        if cache_dir:
+            key = cache_key(data)
+            cached = load_cached(cache_dir, key)
+            if cached is not None:
+                return cached
+        result = scan_source(data)
+    if key is not None:
+        store_cached(cache_dir, key, result)
+    return result
+
+def analyze_file(path, all_package_classes_map, parsed=None):
     """
     Analyze a single java file and return a metadata dict:
     {
@@ -187,90 +673,80 @@ def analyze_file(path, all_package_classes_map):
       'imports': [...], 'extends': [...], 'implements': [...],
       'new': [...], 'static_calls': [...], 'fqcn': [...], 'same_package_candidates': [...]
     }
-    """
-    src = read_file(path)
-    tree = parse_with_javalang(src)
-    ast_info = extract_from_ast(tree)
-    regex_info = extract_with_regex(src)
 
-    package = ast_info.get('package') or None
-    class_names = ast_info.get('types') or []
+    parsed is the parse_file() result for path, if already available
+    (see build_package_class_map); otherwise the file is read and parsed here.
+    """
+    if parsed is None:
+        parsed = parse_file(path)
+    _, ast_info, regex_info, words = parsed
 
-    imports = ast_info.get('imports') or []
-    extends = ast_info.get('extends') or []
-    implements = ast_info.get('implements') or []
+    package = ast_info['package']
+    class_names = ast_info['types']
+    imports = ast_info['imports']
 
-    # Collect direct deps
+    # Collect direct deps (everything below is already a set; union, don't re-add per element)
     deps = set()
 
     # 1) Imports: add simple names and FQCNs
-    for imp in imports:
-        deps.add(imp)
-        deps.add(simple_class_name(imp))
+    deps.update(imports)
+    deps.update(intern(simple_class_name(imp)) for imp in imports)
 
-    # 2) AST creators (new)
-    for c in ast_info.get('creators', []) or []:
-        deps.add(c)
-
-    # 3) regex new
-    for c in regex_info.get('new', []):
-        deps.add(c)
+    # 2) AST creators (new) and 3) regex new
+    new = ast_info['creators'] | regex_info['new']
+    deps |= new
 
     # 4) method invocation qualifiers and member references (qualifier might be class or var)
-    for q in ast_info.get('method_invocations', []) or []:
-        # heuristics: if qualifier starts with uppercase, it's likely a type/class
-        if q and q[0].isupper():
-            deps.add(q)
-    for q in ast_info.get('member_references', []) or []:
-        if q and q[0].isupper():
-            deps.add(q)
+    # heuristics: if qualifier starts with uppercase, it's likely a type/class
+    deps.update(q for q in ast_info['method_invocations'] if q[0].isupper())
+    deps.update(q for q in ast_info['member_references'] if q[0].isupper())
 
     # 5) static class heuristics
-    for c in regex_info.get('static_classes', []):
-        deps.add(c)
+    deps |= regex_info['static_classes']
 
     # 6) fully-qualified names from regex
-    for fq in regex_info.get('fqcn', []):
-        deps.add(fq)
-        deps.add(simple_class_name(fq))
+    deps |= regex_info['fqcn']
+    deps.update(intern(simple_class_name(fq)) for fq in regex_info['fqcn'])
 
     # 7) includes class names in same package (detect usage by simple name)
-    same_pkg_candidates = set()
+    same_pkg_candidates = frozenset()
     if package and package in all_package_classes_map:
-        # any class in the same package referenced by simple name in this file
-        # check if the simple name appears in source (word boundary)
-        for class_in_pkg in all_package_classes_map[package]:
-            # simple check, could be improved by AST type references
-            if re.search(r'\b' + re.escape(class_in_pkg) + r'\b', src):
-                same_pkg_candidates.add(class_in_pkg)
-                deps.add(class_in_pkg)
+        # any class in the same package referenced by simple name in this file:
+        # a whole-word occurrence is just membership in the file's word set
+        # (simple check, could be improved by AST type references)
+        same_pkg_candidates = words & all_package_classes_map[package]
+        deps |= same_pkg_candidates
 
     # 8) extends/implements
-    for e in extends:
-        deps.add(e)
-    for i in implements:
-        deps.add(i)
+    deps |= ast_info['extends']
+    deps |= ast_info['implements']
 
     # heuristics: add capitalized simple identifiers (careful: noisy)
-    # already collected in regex_info['simple_identifiers'] - add cautiously
-    for s in regex_info.get('simple_identifiers', []):
-        # avoid adding if looks like local variable or java.lang types
-        if len(s) > 1 and s[0].isupper():
-            # if it's already known via imports or same-package, keep; else add as candidate
-            deps.add(s)
-
+    # regex_info['simple_identifiers'] only holds capitalized, non-JDK candidates
+    deps |= regex_info['simple_identifiers']
+
+    # static calls: the regex fallback's ClassName.method( matches, or for parsed files
+    # the same thing read off the AST: invocation qualifiers ending in a class-like name
+    static_calls = set(regex_info['static_classes'])
+    for q in ast_info['method_invocations']:
+        name = simple_class_name(q)
+        if RE_CLASS_CANDIDATE.fullmatch(name):
+            static_calls.add(intern(name))
+
+    # sets become sorted lists once, here
     metadata = {
         'file_path': path,
         'package': package,
         'class_names': class_names,
         'imports': imports,
-        'extends': list(extends),
-        'implements': list(implements),
-        'new': list(set(ast_info.get('creators', [])) | set(regex_info.get('new', []))),
-        'static_calls': list(regex_info.get('static_classes', [])),
-        'fqcn': list(regex_info.get('fqcn', [])),
-        'same_package_candidates': list(same_pkg_candidates),
-        'direct_dependencies': sorted([d for d in deps if d]),
+        'extends': sorted(ast_info['extends']),
+        'implements': sorted(ast_info['implements']),
+        'new': sorted(new),
+        'static_calls': sorted(static_calls),
+        'fqcn': sorted(regex_info['fqcn']),
+        'same_package_candidates': sorted(same_pkg_candidates),
+        # JDK noise dropped, unless the package really defines a class of that name
+        'direct_dependencies': sorted([d for d in deps if d and (d not in JAVA_NOISE or d in same_pkg_candidates)]),
     }
 
     return metadata
@@ -278,31 +754,35 @@ def analyze_file(path, all_package_classes_map):
 # -----------------------
 # Build project-wide maps
 # -----------------------
-def build_package_class_map(java_files):
+def build_package_class_map(java_files, jobs=1, cache_dir=None):
     """
-    Build mapping: package -> set(class names found in files in that package)
+    Build mapping: package -> frozenset(class names found in files in that package)
+    The frozensets are built once here and reused as the per-package matcher in
+    analyze_file (set intersection with each file's words).
+
+    Returns (pkg_map, parsed_cache) where parsed_cache[path] = parse_file(path),
+    so analyze_file can reuse the parse instead of doing it again.
+    Files are parsed across `jobs` worker processes, through the on-disk cache in
+    cache_dir if given.
     """
     pkg_map = defaultdict(set)
-    for p in java_files:
-        src = read_file(p)
-        tree = parse_with_javalang(src)
-        package = None
-        if tree and getattr(tree, 'package', None):
-            package = tree.package.name
+    parse = functools.partial(parse_file, cache_dir=cache_dir)
+    parsed_cache = dict(zip(java_files, parallel_map(parse, java_files, jobs)))
+    for p, (parsed_ok, ast_info, _, _) in parsed_cache.items():
+        package = ast_info['package']
         # extract class names via AST and also via simple heuristic if AST fails
         class_names = []
-        if tree and getattr(tree, 'types', None):
-            for t in tree.types:
-                if getattr(t, 'name', None):
-                    class_names.append(t.name)
+        if parsed_ok and ast_info['types']:
+            class_names.extend(ast_info['types'])
         else:
             # fallback: derive from filename (conservative)
             fname = os.path.splitext(os.path.basename(p))[0]
             class_names.append(fname)
         if package:
+            # names come back from worker processes un-interned
             for c in class_names:
-                pkg_map[package].add(c)
-    return {k: list(v) for k, v in pkg_map.items()}
+                pkg_map[intern(package)].add(intern(c))
+    return {k: frozenset(v) for k, v in pkg_map.items()}, parsed_cache
 
 # -----------------------
 # Graph utilities
@@ -314,7 +794,8 @@ def build_graph(metadata_list):
       - if file contains a single top-level type: package.ClassName
       - else fallback to filepath-based key
 
-    Graph value is list of dependency identifiers (simple names and fqcn).
+    Graph value is a sorted tuple of dependency identifiers (simple names and fqcn);
+    tuples since the graph is read-only from here on.
     """
     graph = {}
     meta_by_key = {}
@@ -322,58 +803,185 @@ def build_graph(metadata_list):
     for m in metadata_list:
         pkg = m['package']
         class_names = m['class_names']
+        # dependency names come back from the parse workers un-interned; the graph and
+        # the metadata share the interned tuple
+        deps = m['direct_dependencies'] = tuple(intern(d) for d in m['direct_dependencies'])
         if class_names:
             # if multiple top-level classes, create separate entries for each (rare)
             for cname in class_names:
-                key = (pkg + "." + cname) if pkg else cname
-                graph[key] = m['direct_dependencies']
+                key = intern((pkg + "." + cname) if pkg else cname)
+                graph[key] = deps
                 meta_by_key[key] = m
         else:
             # fallback to filename key
             fname = os.path.splitext(os.path.basename(m['file_path']))[0]
-            key = (pkg + "." + fname) if pkg else fname
-            graph[key] = m['direct_dependencies']
+            key = intern((pkg + "." + fname) if pkg else fname)
+            graph[key] = deps
             meta_by_key[key] = m
 
     return graph, meta_by_key
 
+def resolve_dependencies(graph):
+    """
+    Resolve each node's dependency names to graph nodes.
+    A dependency matches a node if it is the node itself, a dotted suffix of it,
+    or its simple name. Nodes are indexed by simple name up front so each lookup
+    only checks the handful of nodes sharing that name, not the whole graph.
+    Returns: node -> tuple(matched nodes)
+    """
+    by_simple = defaultdict(list)
+    for n in graph:
+        by_simple[simple_class_name(n)].append(n)
+
+    resolved = {}
+
+    def resolve(dep):
+        if dep not in resolved:
+            candidates = by_simple.get(simple_class_name(dep), ())
+            if '.' in dep:
+                suffix = "." + dep
+                candidates = [n for n in candidates if n == dep or n.endswith(suffix)]
+            resolved[dep] = tuple(candidates)
+        return resolved[dep]
+
+    succ = {}
+    for node, deps in graph.items():
+        matched = {}
+        for dep in deps:
+            for mn in resolve(dep):
+                matched[mn] = None
+        succ[node] = tuple(matched)
+    return succ
+
+def strongly_connected_components(succ):
+    """
+    Iterative Tarjan's algorithm (no recursion limit on deep graphs).
+    Returns a list of SCCs (lists of nodes), in reverse topological order:
+    every SCC comes after all SCCs it depends on.
+    """
+    index_of = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    sccs = []
+    counter = 0
+
+    for root in succ:
+        if root in index_of:
+            continue
+        index_of[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(succ[root]))]
+        while work:
+            node, it = work[-1]
+            for nxt in it:
+                if nxt not in index_of:
+                    index_of[nxt] = lowlink[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(succ[nxt])))
+                    break
+                if nxt in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[nxt])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    scc = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        scc.append(member)
+                        if member == node:
+                            break
+                    sccs.append(scc)
+    return sccs
+
+class Closure(Mapping):
+    """
+    Read-only mapping node -> sorted tuple(all reachable nodes, excluding the node itself).
+    Reachability is held as one int bitmap per SCC (bit i = i-th node in sorted
+    order); tuples are only decoded when an entry is accessed, i.e. at write time.
+    """
+
+    def __init__(self, keys, nodes, id_of, scc_of, reach_of_scc):
+        self._keys = keys
+        self._nodes = nodes
+        self._id_of = id_of
+        self._scc_of = scc_of
+        self._reach_of_scc = reach_of_scc
+
+    def __getitem__(self, node):
+        bits = self._reach_of_scc[self._scc_of[node]] & ~(1 << self._id_of[node])
+        # walk the set bits from the low end via the reversed binary string
+        flags = bin(bits)[:1:-1]
+        nodes = self._nodes
+        out = []
+        i = flags.find('1')
+        while i != -1:
+            out.append(nodes[i])
+            i = flags.find('1', i + 1)
+        return tuple(out)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
 def transitive_closure(graph):
     """
     Compute transitive closure for each node (class).
-    Uses BFS/DFS, returns: node -> set(all reachable nodes)
+    The graph is condensed into SCCs (all members of a cycle reach the same set)
+    and, since Tarjan yields SCCs dependencies-first, each SCC's reachability is
+    its successors plus the already computed reachability of their SCCs, OR-ed
+    together as int bitmaps.
+    Returns: Closure mapping node -> sorted tuple(all reachable nodes, excluding the node itself)
     """
-    closure = {}
-    for node in graph:
-        visited = set()
-        stack = [node]
-        while stack:
-            cur = stack.pop()
-            for dep in graph.get(cur, []):
-                # dependency names in graph may be simple names or FQCN.
-                # Try to match dependency to a graph node: prefer exact match, else suffix match
-                matched_nodes = [n for n in graph if n == dep or n.endswith("." + dep) or n.split('.')[-1] == dep]
-                for mn in matched_nodes:
-                    if mn not in visited and mn != node:
-                        visited.add(mn)
-                        stack.append(mn)
-        closure[node] = sorted(list(visited))
-    return closure
+    succ = resolve_dependencies(graph)
+    # ids in sorted name order, so bitmaps decode straight into sorted tuples
+    nodes = sorted(graph)
+    id_of = {n: i for i, n in enumerate(nodes)}
+    scc_of = {}
+    reach_of_scc = []
+    for scc in strongly_connected_components(succ):
+        idx = len(reach_of_scc)
+        for member in scc:
+            scc_of[member] = idx
+        bits = 0
+        for member in scc:
+            for mn in succ[member]:
+                bits |= 1 << id_of[mn]
+                other = scc_of[mn]
+                if other != idx:
+                    bits |= reach_of_scc[other]
+        reach_of_scc.append(bits)
+    return Closure(tuple(graph), nodes, id_of, scc_of, reach_of_scc)
 
 # -----------------------
 # Main
 # -----------------------
-def main(root, out_path):
+def main(root, out_path, jobs=None, cache_dir=None):
+    jobs = jobs or os.cpu_count() or 1
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        prune_cache(cache_dir)
     print(f"Scanning Java files under: {root}")
-    java_files = list_java_files(root)
+    java_files = list(list_java_files(root))
     print(f"Found {len(java_files)} .java files")
 
-    pkg_map = build_package_class_map(java_files)
+    pkg_map, parsed_cache = build_package_class_map(java_files, jobs, cache_dir)
     print(f"Discovered {len(pkg_map)} packages")
 
-    metadata_list = []
-    for f in java_files:
-        meta = analyze_file(f, pkg_map)
-        metadata_list.append(meta)
+    # analysis is cheap next to parsing, so it runs in-process rather than paying
+    # to ship the package map and every parse result to a second pool; entries are
+    # popped as they are used so the parse results (word sets mostly) don't outlive it
+    metadata_list = [analyze_file(f, pkg_map, parsed_cache.pop(f)) for f in java_files]
 
     graph, meta_by_key = build_graph(metadata_list)
     print(f"Built graph with {len(graph)} nodes")
@@ -385,12 +993,11 @@ def main(root, out_path):
         'graph': graph,
         'meta': meta_by_key,
     }
-    with open(out_path, 'w', encoding='utf-8') as fh:
-        json.dump(out, fh, indent=2)
+    with open(out_path, 'wb') as fh:
+        fh.write(dump_json_bytes(out, indent=True))
 
     trans_out_path = out_path.replace('.json', '_transitive.json')
-    with open(trans_out_path, 'w', encoding='utf-8') as fh:
-        json.dump(closure, fh, indent=2)
+    write_json_stream(trans_out_path, closure)
 
     print(f"Wrote direct graph to {out_path}")
     print(f"Wrote transitive closure to {trans_out_path}")
@@ -399,5 +1006,10 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Extract Java class dependency graph (direct+transitive)')
     parser.add_argument('root', help='root folder of Java project')
     parser.add_argument('--out', default='results.json', help='output JSON file')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: CPU count, 1 = no pool)')
+    parser.add_argument('--cache', action='store_true',
+                        help=f'cache per-file results in {default_cache_dir()} (off by default)')
+    parser.add_argument('--cache-dir', default=None, help='cache per-file results in this directory (implies --cache)')
     args = parser.parse_args()
-    main(args.root, args.out)
+    cache_dir = args.cache_dir or (default_cache_dir() if args.cache else None)
+    main(args.root, args.out, args.jobs, cache_dir)
@@ -1,18 +1,58 @@
 import os
+import functools
+from collections import deque
+
 import javalang
 
+def iter_java_entries(root):
+    """Yield os.DirEntry for all .java files under root (no extra stat per entry, unlike os.walk)."""
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_java_entries(entry.path)
+            elif entry.name.endswith(".java") and not entry.is_dir():
+                yield entry
+
+
 def build_index(project_root):
     """Map class name → file path for all .java files in project."""
     index = {}
-    for root, _, files in os.walk(project_root):
-        for f in files:
-            if f.endswith(".java"):
-                class_name = f.replace(".java", "")
-                index[class_name] = os.path.join(root, f)
+    for entry in iter_java_entries(project_root):
+        class_name = entry.name.replace(".java", "")
+        index[class_name] = entry.path
     return index
 
 
+@functools.lru_cache(maxsize=16)
+def build_index_cached(project_root):
+    """
+    build_index, computed once per project root. This is a snapshot: call
+    clear_caches() after .java files are added, removed or renamed.
+    """
+    return build_index(project_root)
+
+
 def parse_file(filepath):
+    """Parse a Java file and extract class references (cached until the file's mtime changes)."""
+    return set(_parse_file_cached(filepath, os.stat(filepath).st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_file_cached(filepath, mtime_ns):
+    return frozenset(_parse_file(filepath))
+
+
+def clear_caches():
+    """Drop the cached project indexes and parse results."""
+    build_index_cached.cache_clear()
+    _parse_file_cached.cache_clear()
+
+
+def _parse_file(filepath):
     """Parse a Java file and extract class references using javalang AST."""
     with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
         content = f.read()
@@ -26,7 +66,7 @@ def parse_file(filepath):
 
     # 1. Imports
     for imp in tree.imports:
-        name = imp.path.split(".")[-1]
+        name = imp.path.rpartition(".")[2]
         refs.add(name)
 
     # 2. Class declaration (extends, implements)
@@ -66,22 +106,18 @@ def parse_file(filepath):
 
 def get_dependencies(target_file, project_root):
     """Return all recursive project dependencies for given file."""
-    index = build_index(project_root)
-    visited = set()
+    index = build_index_cached(project_root)
+    visited = {target_file}
     result = set()
-
-    def dfs(path):
-        if path in visited:
-            return
-        visited.add(path)
-
-        refs = parse_file(path)
-
-        for r in refs:
+    # iterative BFS: no recursion limit on deep dependency chains
+    queue = deque([target_file])
+    while queue:
+        path = queue.popleft()
+        for r in parse_file(path):
             if r in index:
                 dep_path = index[r]
                 result.add(dep_path)
-                dfs(dep_path)
-
-    dfs(target_file)
+                if dep_path not in visited:
+                    visited.add(dep_path)
+                    queue.append(dep_path)
     return result